@@ -2,26 +2,37 @@
 """
 Image Preprocessing for Photography Portfolio
 
-Converts images from source/photos/ to optimized WebP format
+Converts images from gallery/<name>/ to optimized WebP format
 with multiple sizes for responsive loading.
 
 Usage:
-    uv run process-photos [--force] [-j JOBS]
+    uv run build-gallery [--force] [-j JOBS] [--webp-method M]
 
 Options:
-    --force         Reprocess all images, even if unchanged
-    -j, --jobs N    Number of parallel jobs (default: 1, 0 = auto)
+    --force             Reprocess all images, even if unchanged
+    -j, --jobs N        Number of parallel jobs (default: 1, 0 = auto)
+    --webp-method M     WebP encoder method 0-6 for all sizes
+                        (default: per size, see WEBP_METHODS)
 """
 
 import argparse
-import json
+import functools
+import hashlib
+import io
+import mmap
+import multiprocessing
 import os
+import queue
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
-from PIL import Image
+import orjson
+import PIL
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
 
 # Configuration - paths relative to project root
 SOURCE_BASE = "gallery"  # Scan subdirectories as galleries
@@ -36,11 +47,32 @@ SIZES = {
 }
 
 WEBP_QUALITY = 85
-SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".tiff", ".bmp"}
+HASH_CHUNK_SIZE = 1024 * 1024  # Read size when hashing sources
+MMAP_THRESHOLD = 2 * 1024 * 1024  # Sources at least this large are memory-mapped
+
+# Timestamp resolutions, coarsest first, that output filesystems may round
+# utime() stamps to: FAT, 1 s (ext3, HFS+, many SMB/NFS servers), exFAT,
+# milliseconds, microseconds, NTFS
+MTIME_RESOLUTIONS_NS = (2_000_000_000, 1_000_000_000, 10_000_000, 1_000_000, 1_000, 100)
+
+# WebP encoder effort per size (0 = fastest, 6 = smallest files)
+WEBP_METHODS = {
+    "thumb": 0,      # Size cost is negligible at 400px
+    "medium": 3,
+    "full": 4,       # Pillow's default
+}
+SUPPORTED_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".webp", ".tif", ".tiff", ".bmp"})
+# Pillow formats of SUPPORTED_EXTENSIONS; only these are probed when opening
+SOURCE_FORMATS = ("JPEG", "PNG", "WEBP", "TIFF", "BMP")
 
 
+@functools.lru_cache(maxsize=1)
 def get_project_root() -> Path:
-    """Find project root by looking for pyproject.toml."""
+    """Find project root by looking for pyproject.toml.
+
+    The result is cached for the process; call get_project_root.cache_clear()
+    after changing the working directory.
+    """
     current = Path.cwd()
 
     # Check current directory and parents
@@ -52,15 +84,6 @@ def get_project_root() -> Path:
     return current
 
 
-def get_orientation(width: int, height: int) -> str:
-    """Determine image orientation."""
-    if width > height:
-        return "landscape"
-    elif height > width:
-        return "portrait"
-    return "square"
-
-
 def discover_galleries(source_base: Path) -> list[str]:
     """Find all gallery subdirectories in input folder."""
     galleries = []
@@ -70,6 +93,18 @@ def discover_galleries(source_base: Path) -> list[str]:
     return sorted(galleries)
 
 
+def find_source_images(source_dir: Path) -> list[Path]:
+    """Find supported images in a gallery directory with a single scan."""
+    with os.scandir(source_dir) as entries:
+        source_images = [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_file()
+            and os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS
+        ]
+    return sorted(source_images)
+
+
 def generate_display_name(gallery_name: str) -> str:
     """Generate display name from directory name (title case with spaces)."""
     return gallery_name.replace('_', ' ').replace('-', ' ').title()
@@ -77,8 +112,7 @@ def generate_display_name(gallery_name: str) -> str:
 
 def update_config_galleries(config_path: Path, galleries: list[str]) -> None:
     """Update config.json galleries section to match discovered galleries."""
-    with open(config_path) as f:
-        config = json.load(f)
+    config = orjson.loads(config_path.read_bytes())
 
     existing_galleries = config.get('galleries', {})
     existing_items = existing_galleries.get('items', {})
@@ -123,100 +157,306 @@ def update_config_galleries(config_path: Path, galleries: list[str]) -> None:
 
     config['galleries'] = new_galleries
 
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=2)
+    config_path.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+
+
+def fit_dimensions(width: int, height: int, target_size: int) -> tuple[int, int]:
+    """Scale dimensions so the longest edge is target_size, preserving aspect ratio."""
+    if width >= height:
+        return target_size, int(height * (target_size / width))
+    return int(width * (target_size / height)), target_size
 
 
 def resize_image(img: Image.Image, target_size: int) -> Image.Image:
-    """Resize image so longest edge is exactly target_size, preserving aspect ratio."""
+    """Resize image so longest edge is target_size, preserving aspect ratio.
+
+    Images whose longest edge is already at most target_size are returned
+    unchanged: upscaling costs time and only blurs the result.
+    """
     width, height = img.size
 
-    # Always resize to target_size (up or down) for uniform dimensions
-    if width >= height:
-        if width == target_size:
-            return img
-        new_width = target_size
-        new_height = int(height * (target_size / width))
-    else:
-        if height == target_size:
+    if max(width, height) <= target_size:
+        return img
+
+    new_width, new_height = fit_dimensions(width, height, target_size)
+
+    # Box-reduce by the integer part of the scale factor first (fast SIMD
+    # path), so LANCZOS only has to cover the remaining factor below 2x
+    factor = max(width, height) // target_size
+    if factor >= 2:
+        img = img.reduce(factor)
+        if img.size == (new_width, new_height):
             return img
-        new_height = target_size
-        new_width = int(width * (target_size / height))
 
     return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
 
 
-def needs_processing(source_path: Path, output_paths: list[Path]) -> bool:
-    """Check if source image needs to be processed."""
-    source_mtime = os.path.getmtime(source_path)
+def scan_outputs(output_dir: Path) -> dict[str, dict[str, os.stat_result]]:
+    """Map each size to {image id: stat result} for its existing WebP outputs.
 
-    for output_path in output_paths:
-        if not output_path.exists():
-            return True
-        if os.path.getmtime(output_path) < source_mtime:
+    Each output is stat'ed once here; the results serve both the freshness
+    check and the size report. Temporary files left by an interrupted
+    write_outputs are removed.
+    """
+    output_stats = {}
+    for size_name in SIZES:
+        size_stats = {}
+        with os.scandir(output_dir / size_name) as entries:
+            for entry in entries:
+                if entry.name.endswith(".webp"):
+                    size_stats[entry.name.removesuffix(".webp")] = entry.stat()
+                elif entry.name.endswith(".webp.tmp"):
+                    os.unlink(entry.path)
+        output_stats[size_name] = size_stats
+    return output_stats
+
+
+def same_mtime(output_mtime: int, source_mtime: int) -> bool:
+    """Check if an output's mtime matches its source's.
+
+    Filesystems with coarse timestamps round the stamp written by
+    write_outputs, so the two are compared at the coarsest resolution the
+    output's mtime is a multiple of.
+    """
+    for resolution in MTIME_RESOLUTIONS_NS:
+        if output_mtime % resolution == 0:
+            return abs(output_mtime - source_mtime) < resolution
+
+    return output_mtime == source_mtime
+
+
+def needs_processing(
+    base_name: str,
+    source_mtime: int,
+    output_stats: dict[str, dict[str, os.stat_result]]
+) -> bool:
+    """Check if source image needs to be processed.
+
+    Outputs carry their source's mtime (see write_outputs), so any
+    difference beyond the output filesystem's timestamp resolution means
+    the source changed since its outputs were written.
+    """
+    for size_stats in output_stats.values():
+        output_stat = size_stats.get(base_name)
+        # Missing from the scan means the output file doesn't exist
+        if output_stat is None or not same_mtime(output_stat.st_mtime_ns, source_mtime):
             return True
 
     return False
 
 
+def encode_webp(img: Image.Image, method: int) -> bytes:
+    """Encode an image as WebP in memory."""
+    buffer = io.BytesIO()
+    img.save(buffer, "WEBP", quality=WEBP_QUALITY, method=method)
+    return buffer.getvalue()
+
+
+def read_source(source_path: Path) -> io.BytesIO | mmap.mmap:
+    """Load a source file into a seekable in-memory file for decoding.
+
+    Small files are read with a single read() call. Larger ones are
+    memory-mapped, so the decoder reads straight from the page cache
+    instead of through many small buffered reads.
+    """
+    with open(source_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            return io.BytesIO(f.read())
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def hash_source(data: io.BytesIO | mmap.mmap) -> str:
+    """Content hash recorded in the manifest to detect unchanged sources."""
+    # getvalue() shares the bytes the BytesIO was created from (no copy)
+    buffer = data.getvalue() if isinstance(data, io.BytesIO) else data
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+
+def has_same_content(source_path: Path, entry: dict | None) -> bool:
+    """Check a source against the content hash recorded at its last build."""
+    if not entry or "hash" not in entry:
+        return False
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(source_path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest() == entry["hash"]
+
+
 def process_image(
     source_path: Path,
     base_name: str,
-    output_dir: Path,
-    force: bool = False
-) -> tuple[str, dict | str | None]:
-    """Process a single image into multiple sizes."""
-    output_paths = {
-        size: output_dir / size / f"{base_name}.webp"
-        for size in SIZES
-    }
-
-    if not force and not needs_processing(source_path, list(output_paths.values())):
-        return "skipped", None
-
+    webp_method: int | None = None
+) -> tuple[str, tuple[dict, dict[str, bytes]] | str]:
+    """Process a single image into multiple sizes.
+
+    Returns the manifest entry and the encoded WebP bytes per size; writing
+    them to disk is left to the caller so it overlaps with encoding.
+    webp_method overrides WEBP_METHODS for every size.
+    """
     try:
-        with Image.open(source_path) as img:
-            # Convert to RGB if necessary
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-
+        # Decode from memory; the file itself is closed after reading
+        with (
+            read_source(source_path) as data,
+            Image.open(data, formats=SOURCE_FORMATS) as source,
+        ):
+            img = source
+
+            # Hash the raw bytes before decoding: closing the source image
+            # during the resize cascade also closes the file it reads from
+            source_hash = hash_source(data)
+
+            # Read EXIF once, from the already open file; the parsed tags are
+            # cached on the image, so the transpose below reuses them
+            exif_orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+
+            # Manifest dimensions are those of the original file as displayed:
+            # orientations 5-8 rotate it by 90 degrees
             original_width, original_height = img.size
-            orientation = get_orientation(original_width, original_height)
-
-            # Generate each size
-            for size_name, max_size in SIZES.items():
-                resized = resize_image(img, max_size)
-                output_path = output_paths[size_name]
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                resized.save(output_path, "WEBP", quality=WEBP_QUALITY)
+            if exif_orientation in (5, 6, 7, 8):
+                original_width, original_height = original_height, original_width
+            if original_width > original_height:
+                orientation = "landscape"
+            elif original_height > original_width:
+                orientation = "portrait"
+            else:
+                orientation = "square"
+
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale (DCT scaling) as
+            # long as the result still covers the largest output: draft()
+            # keeps both edges at or above that output's own dimensions. Phone
+            # photos with an MPF segment open as MPO, a JPEG subclass
+            if img.format in ("JPEG", "MPO"):
+                img.draft("RGB", fit_dimensions(*img.size, max(SIZES.values())))
+
+            # Decode the source once, up front, before the resize passes
+            img.load()
+
+            # Apply the EXIF rotation a single time, to the base image every
+            # size derives from (skipped, with its copy, when upright)
+            if exif_orientation != 1:
+                img = ImageOps.exif_transpose(img)
+                # The with statement still references the opened image;
+                # release its raster now that the rotated copy replaces it
+                source.close()
+
+            # Keep real transparency as RGBA: alpha channels, and the tRNS
+            # transparent color of palette, grayscale and RGB PNGs
+            if img.mode == "P":
+                img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+            elif img.mode in ("LA", "PA") or "transparency" in img.info:
+                img = img.convert("RGBA")
+
+            # Drop the alpha channel when every pixel is opaque, and convert
+            # any other mode (grayscale, CMYK...) to RGB
+            if img.mode == "RGBA":
+                if img.getextrema()[3][0] == 255:
+                    img = img.convert("RGB")
+            elif img.mode != "RGB":
+                img = img.convert("RGB")
 
-            return "processed", {
+            # Likewise once a conversion has replaced it
+            if img is not source:
+                source.close()
+
+            # Generate each size, largest first, deriving each one from the
+            # previous so only the first resize touches the full-size source
+            outputs = {}
+            current = img
+            encoded = None
+            for size_name, max_size in sorted(SIZES.items(), key=lambda kv: -kv[1]):
+                resized = resize_image(current, max_size)
+                # Free each raster as soon as the next size is derived from
+                # it (the base image first), so a worker holds at most two
+                if resized is not current:
+                    current.close()
+                    current = resized
+                    encoded = None
+                # Sizes a small source doesn't reach share one raster: encode
+                # it once (with the larger size's method) and reuse the bytes
+                if encoded is None:
+                    method = WEBP_METHODS[size_name] if webp_method is None else webp_method
+                    encoded = encode_webp(current, method)
+                outputs[size_name] = encoded
+
+            return "processed", ({
                 "id": base_name,
                 "orientation": orientation,
                 "width": original_width,
-                "height": original_height
-            }
+                "height": original_height,
+                "hash": source_hash
+            }, outputs)
 
+    except UnidentifiedImageError:
+        return "error", "cannot identify image file"
     except Exception as e:
         return "error", str(e)
 
 
-def clean_orphans(output_dir: Path, valid_ids: set[str]) -> int:
-    """Remove processed images that no longer have source files."""
-    removed = 0
+def write_outputs(
+    output_dir: Path,
+    base_name: str,
+    outputs: dict[str, bytes],
+    source_mtime: int
+) -> None:
+    """Write the encoded WebP files of one image, stamped with the source mtime.
+
+    Each file is written in one call to a hidden temporary name, stamped,
+    then renamed into place, so an interrupted run never leaves a
+    truncated output that looks up to date.
+    """
+    for size_name, data in outputs.items():
+        output_path = output_dir / size_name / f"{base_name}.webp"
+        temp_path = output_path.with_name(f".{output_path.name}.tmp")
+        try:
+            temp_path.write_bytes(data)
+            os.utime(temp_path, ns=(source_mtime, source_mtime))
+            os.replace(temp_path, output_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+
+def stamp_outputs(output_dir: Path, base_name: str, source_mtime: int) -> None:
+    """Set the mtime of an image's WebP files to its source's."""
+    for size_name in SIZES:
+        output_path = output_dir / size_name / f"{base_name}.webp"
+        os.utime(output_path, ns=(source_mtime, source_mtime))
+
+
+def clean_orphans(
+    output_dir: Path,
+    valid_ids: set[str],
+    output_stats: dict[str, dict[str, os.stat_result]]
+) -> int:
+    """Remove processed images that no longer have source files.
+
+    Orphans are taken from the scan_outputs snapshot instead of listing the
+    size directories again; an image counts once even if some of its sizes
+    are already missing.
+    """
+    orphans = set().union(*output_stats.values()) - valid_ids
 
     for size_name in SIZES:
-        size_dir = output_dir / size_name
-        if not size_dir.exists():
-            continue
+        for orphan_id in orphans:
+            (output_dir / size_name / f"{orphan_id}.webp").unlink(missing_ok=True)
 
-        for webp_file in size_dir.glob("*.webp"):
-            file_id = webp_file.stem
-            if file_id not in valid_ids:
-                webp_file.unlink()
-                removed += 1
+    return len(orphans)
 
-    return removed // len(SIZES)
+
+def remove_tree(path: str | Path) -> None:
+    """Delete a directory tree with os.scandir, never following symlinks."""
+    with os.scandir(path) as it:
+        entries = list(it)
+
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            remove_tree(entry.path)
+        else:
+            os.unlink(entry.path)
+
+    os.rmdir(path)
 
 
 def clean_orphan_galleries(output_base: Path, valid_galleries: set[str]) -> list[str]:
@@ -229,105 +469,200 @@ def clean_orphan_galleries(output_base: Path, valid_galleries: set[str]) -> list
         if item.is_dir() and not item.name.startswith('.'):
             if item.name not in valid_galleries:
                 # Remove the entire gallery directory
-                import shutil
-                shutil.rmtree(item)
+                remove_tree(item)
                 removed.append(item.name)
 
     return removed
 
 
+def log_ready(
+    log: queue.SimpleQueue,
+    source_images: list[Path],
+    report: dict[Path, str],
+    logged: int
+) -> int:
+    """Log report lines in name order, up to the first image still pending.
+
+    Returns how many of source_images have been logged.
+    """
+    while logged < len(source_images) and source_images[logged] in report:
+        log.put(report[source_images[logged]])
+        logged += 1
+    return logged
+
+
 def process_gallery(
     gallery_name: str,
     source_dir: Path,
+    source_images: list[Path],
     output_dir: Path,
+    executor: Executor,
+    slots: threading.Semaphore,
+    log: queue.SimpleQueue,
     force: bool = False,
-    jobs: int = 1
-) -> tuple[int, int, int]:
-    """Process a single gallery. Returns (processed, skipped, errors) counts."""
+    webp_method: int | None = None
+) -> tuple[int, int, int, int, int]:
+    """Process a single gallery.
+
+    Returns (processed, skipped, errors) counts, followed by the total
+    size in bytes of the sources and of their up-to-date outputs.
+
+    source_images is the gallery's find_source_images() result, scanned
+    once by the caller. Images are submitted to the shared executor, each
+    holding one of the run-wide slots until its result is written. Report
+    lines are put on log as soon as they are ready, in name order, so the
+    caller can stream them without concurrent galleries interleaving.
+    """
     # Create output directories
     for size_name in SIZES:
         (output_dir / size_name).mkdir(parents=True, exist_ok=True)
 
-    # Find all source images
-    source_images = []
-    for ext in SUPPORTED_EXTENSIONS:
-        source_images.extend(source_dir.glob(f"*{ext}"))
-        source_images.extend(source_dir.glob(f"*{ext.upper()}"))
-
-    source_images = sorted(set(source_images))
-
     if not source_images:
-        print(f"  No images found in '{source_dir}'")
-        return 0, 0, 0
+        log.put(f"  No images found in '{source_dir}'")
+        return 0, 0, 0, 0, 0
 
     # Process images
     processed = 0
     skipped = 0
     errors = 0
-    manifest_images = []
+    source_size = 0
+    output_size = 0
+    manifest_images: dict[str, dict] = {}
     valid_ids: set[str] = set()
 
     # Load existing manifest for skipped images
     manifest_path = output_dir / MANIFEST_FILE
     existing_manifest: dict = {}
     if manifest_path.exists():
-        with open(manifest_path) as f:
-            existing_manifest = json.load(f)
+        existing_manifest = orjson.loads(manifest_path.read_bytes())
+    existing_by_id = {img["id"]: img for img in existing_manifest.get("images", [])}
 
     # Build valid_ids first (needed for orphan cleanup)
     for source_path in source_images:
         valid_ids.add(source_path.stem)
 
-    # Determine worker count
-    max_workers = jobs if jobs > 0 else (os.cpu_count() or 4)
+    # Snapshot existing outputs with one directory scan per size
+    output_stats = scan_outputs(output_dir)
 
-    # Process images (parallel or sequential based on jobs)
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(process_image, path, path.stem, output_dir, force): path
-            for path in source_images
-        }
+    # Report lines per source, logged in name order as soon as every image
+    # before them is done
+    report: dict[Path, str] = {}
+    logged = 0
+    changed = []
+    for source_path in source_images:
+        base_name = source_path.stem
+        # One stat per source: mtime for the check, size for the report
+        source_stat = source_path.stat()
+        source_mtime = source_stat.st_mtime_ns
+        source_size += source_stat.st_size
+
+        stale = force or needs_processing(base_name, source_mtime, output_stats)
+
+        # Same content under a new mtime (git checkout, copy, touch): re-stamp
+        # the outputs so later runs take the mtime fast path again
+        if (
+            stale
+            and not force
+            and all(base_name in size_stats for size_stats in output_stats.values())
+        ):
+            try:
+                if has_same_content(source_path, existing_by_id.get(base_name)):
+                    stamp_outputs(output_dir, base_name, source_mtime)
+                    stale = False
+            except OSError:
+                # Unreadable source or unwritable outputs: reprocess it, so the
+                # failure is reported for this image like any other
+                pass
+
+        # Unchanged images are resolved here without a worker round-trip
+        if not stale:
+            report[source_path] = f"  · {source_path.name} (unchanged)"
+            skipped += 1
+            output_size += sum(
+                size_stats[base_name].st_size for size_stats in output_stats.values()
+            )
+            # Use existing manifest data
+            existing = existing_by_id.get(base_name)
+            if existing:
+                manifest_images[base_name] = existing
+            continue
 
-        for future in as_completed(futures):
-            source_path = futures[future]
-            base_name = source_path.stem
-            status, data = future.result()
-
-            if status == "processed":
-                print(f"  ✓ {source_path.name} → thumb, medium, full")
-                processed += 1
-                manifest_images.append(data)
-            elif status == "skipped":
-                print(f"  · {source_path.name} (unchanged)")
-                skipped += 1
-                # Use existing manifest data
-                for img in existing_manifest.get("images", []):
-                    if img["id"] == base_name:
-                        manifest_images.append(img)
-                        break
-            else:
-                print(f"  ✗ {source_path.name} - Error: {data}")
-                errors += 1
+        changed.append((source_path, source_mtime, source_stat.st_size))
+
+    logged = log_ready(log, source_images, report, logged)
+
+    # Largest sources first (LPT scheduling): a big file submitted last
+    # would leave the other workers idle while it finishes alone
+    changed.sort(key=lambda task: task[2], reverse=True)
+
+    # Each in-flight image holds one of the slots shared by all galleries:
+    # the pool always has queued work, while finished results can't pile up
+    # in memory waiting to be written (backpressure). Results are collected
+    # in submission order, like Executor.map, so writes are deterministic.
+    queued = deque(changed)
+    in_flight: deque = deque()
+    try:
+        while queued or in_flight:
+            # Only wait for a slot with nothing of our own in flight: a gallery
+            # blocking while it holds slots could deadlock with the others
+            while queued and slots.acquire(blocking=not in_flight):
+                source_path, source_mtime, _ = queued.popleft()
+                try:
+                    future = executor.submit(
+                        process_image, source_path, source_path.stem, webp_method
+                    )
+                except BaseException:
+                    slots.release()
+                    raise
+                in_flight.append((future, source_path, source_mtime))
+
+            future, source_path, source_mtime = in_flight.popleft()
+            try:
+                status, data = future.result()
+
+                if status == "processed":
+                    # Write here while the workers keep encoding
+                    image, outputs = data
+                    try:
+                        write_outputs(output_dir, image["id"], outputs, source_mtime)
+                    except OSError as e:
+                        status, data = "error", str(e)
+
+                if status == "processed":
+                    report[source_path] = f"  ✓ {source_path.name} → thumb, medium, full"
+                    processed += 1
+                    output_size += sum(len(output) for output in outputs.values())
+                    manifest_images[image["id"]] = image
+                else:
+                    report[source_path] = f"  ✗ {source_path.name} - Error: {data}"
+                    errors += 1
+
+                logged = log_ready(log, source_images, report, logged)
+            finally:
+                slots.release()
+    finally:
+        # A failure (e.g. a broken pool after a worker was killed) ends this
+        # gallery: hand back the slots of its remaining images so the other
+        # galleries fail fast instead of blocking on them forever
+        for future, _, _ in in_flight:
+            future.cancel()
+            slots.release()
 
     # Clean orphaned files
-    removed = clean_orphans(output_dir, valid_ids)
+    removed = clean_orphans(output_dir, valid_ids, output_stats)
     if removed > 0:
-        print(f"  🗑  Removed {removed} orphaned image(s)")
-
-    # Sort manifest
-    manifest_images.sort(key=lambda x: x["id"])
+        log.put(f"  🗑  Removed {removed} orphaned image(s)")
 
-    # Write manifest
+    # Write manifest, sorted by id
     manifest = {
-        "images": manifest_images,
+        "images": [manifest_images[image_id] for image_id in sorted(manifest_images)],
         "generated": datetime.now(timezone.utc).isoformat(),
         "sizes": SIZES
     }
 
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+    manifest_path.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
 
-    return processed, skipped, errors
+    return processed, skipped, errors, source_size, output_size
 
 
 def main() -> int:
@@ -346,6 +681,14 @@ def main() -> int:
         default=1,
         help="Number of parallel jobs (default: 1, use 0 for auto based on CPU count)"
     )
+    parser.add_argument(
+        "--webp-method",
+        type=int,
+        choices=range(7),
+        metavar="{0-6}",
+        help="WebP encoder method for all sizes, 0 = fastest, 6 = smallest files "
+             "(default: per size, 0 for thumb up to 4 for full)"
+    )
     args = parser.parse_args()
 
     # Find project root
@@ -358,6 +701,12 @@ def main() -> int:
         print(f"Expected path: {source_base.absolute()}")
         return 1
 
+    # Pillow-SIMD versions carry a ".postN" suffix; make a silent fallback
+    # to stock Pillow (e.g. a dependency pulling in "pillow") visible
+    if ".post" not in PIL.__version__:
+        print(f"Warning: running on stock Pillow {PIL.__version__}, not Pillow-SIMD; "
+              "resizing will be slower\n")
+
     # Discover galleries (subdirectories in input/)
     galleries = discover_galleries(source_base)
 
@@ -381,35 +730,72 @@ def main() -> int:
     total_source_size = 0
     total_output_size = 0
 
-    for gallery_name in galleries:
-        source_dir = source_base / gallery_name
-        output_dir = output_base / gallery_name
-
-        # Count source images for this gallery
-        source_images = []
-        for ext in SUPPORTED_EXTENSIONS:
-            source_images.extend(source_dir.glob(f"*{ext}"))
-            source_images.extend(source_dir.glob(f"*{ext.upper()}"))
-        source_images = list(set(source_images))
-
-        print(f"[{gallery_name}] Processing {len(source_images)} images...")
-
-        processed, skipped, errors = process_gallery(
-            gallery_name, source_dir, output_dir, args.force, args.jobs
-        )
-
-        total_processed += processed
-        total_skipped += skipped
-        total_errors += errors
-
-        # Calculate sizes for this gallery
-        total_source_size += sum(p.stat().st_size for p in source_images)
-        for size_name in SIZES:
-            size_dir = output_dir / size_name
-            if size_dir.exists():
-                total_output_size += sum(p.stat().st_size for p in size_dir.glob("*.webp"))
+    # Determine worker count
+    max_workers = args.jobs if args.jobs > 0 else (os.cpu_count() or 4)
+
+    # All galleries run concurrently, one orchestration thread each, feeding
+    # a single pool of worker processes (CPU-bound, so threads would contend
+    # on the GIL). The pool stays busy across gallery boundaries instead of
+    # draining at the end of each gallery. Image.init preloads the format
+    # plugins once per worker. The slots bound the images in flight across
+    # all galleries to 2 x workers. Workers are spawned rather than forked:
+    # the pool starts them from the gallery threads, and forking a process
+    # that is running other threads can deadlock the child.
+    logs: dict[str, queue.SimpleQueue] = {
+        gallery_name: queue.SimpleQueue() for gallery_name in galleries
+    }
+    slots = threading.Semaphore(2 * max_workers)
 
-        print()
+    # Scan each source directory once; the list feeds both the gallery
+    # and the report below
+    sources: dict[str, list[Path]] = {
+        gallery_name: find_source_images(source_base / gallery_name)
+        for gallery_name in galleries
+    }
+    with (
+        ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=Image.init
+        ) as executor,
+        ThreadPoolExecutor(max_workers=len(galleries)) as gallery_executor,
+    ):
+        gallery_futures = {
+            gallery_name: gallery_executor.submit(
+                process_gallery,
+                gallery_name,
+                source_base / gallery_name,
+                sources[gallery_name],
+                output_base / gallery_name,
+                executor,
+                slots,
+                logs[gallery_name],
+                args.force,
+                args.webp_method
+            )
+            for gallery_name in galleries
+        }
+        # None marks the end of a gallery's log, however it finished
+        for gallery_name, gallery_future in gallery_futures.items():
+            gallery_future.add_done_callback(lambda _, log=logs[gallery_name]: log.put(None))
+
+        # Report galleries in order: the current one streams its lines as they
+        # come, later ones queue theirs until their turn
+        for gallery_name, gallery_future in gallery_futures.items():
+            image_count = len(sources[gallery_name])
+            print(f"[{gallery_name}] Processing {image_count} images...", flush=True)
+            while (line := logs[gallery_name].get()) is not None:
+                print(line, flush=True)
+
+            processed, skipped, errors, source_size, output_size = gallery_future.result()
+
+            total_processed += processed
+            total_skipped += skipped
+            total_errors += errors
+            total_source_size += source_size
+            total_output_size += output_size
+
+            print()
 
     # Clean orphaned galleries
     removed_galleries = clean_orphan_galleries(output_base, set(galleries))